@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+import loop as seashell
+
+
+class BrokenFactory(seashell.LoopFactory):
+    def create_loop(self):
+        raise OSError("unavailable")
+
+    def get_policy(self):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def calibrations(monkeypatch):
+    calls = []
+
+    def calibrate(profile, candidates=None):
+        calls.append(profile)
+        return {name: float(index + 1) for index, name in enumerate(sorted(candidates))}
+
+    monkeypatch.setattr(seashell, "calibrate_factories", calibrate)
+    return calls
+
+
+def test_winner_is_cached_per_environment_and_profile(tmp_path, calibrations):
+    cache = tmp_path / "calibration.json"
+    first = seashell.EventLoopManager(selection="adaptive", cache_path=str(cache))
+    again = seashell.EventLoopManager(selection="adaptive", cache_path=str(cache))
+    assert calibrations == ["task"]
+    assert type(again.factory) is type(first.factory)
+
+    seashell.EventLoopManager(selection="adaptive", profile="timer", cache_path=str(cache))
+    assert calibrations == ["task", "timer"]
+    entries = json.loads(cache.read_text())
+    assert len(entries) == 2
+    key = seashell.calibration_cache_key("task", seashell.available_factories())
+    assert entries[key]["factory"] in seashell.available_factories()
+
+
+def test_unusable_cache_is_recalibrated(tmp_path, calibrations):
+    cache = tmp_path / "calibration.json"
+    cache.write_text("{not json")
+    seashell.EventLoopManager(selection="adaptive", cache_path=str(cache))
+    key = seashell.calibration_cache_key("task", seashell.available_factories())
+    cache.write_text(json.dumps({key: {"factory": "gone"}}))
+    seashell.EventLoopManager(selection="adaptive", cache_path=str(cache))
+    assert calibrations == ["task", "task"]
+
+
+def test_cache_path_honours_the_environment(monkeypatch, tmp_path):
+    monkeypatch.delenv("SEASHELL_CALIBRATION_CACHE", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert seashell.default_calibration_cache_path() == str(
+        tmp_path / "seashell" / "loop-calibration.json")
+    monkeypatch.setenv("SEASHELL_CALIBRATION_CACHE", "/elsewhere.json")
+    assert seashell.default_calibration_cache_path() == "/elsewhere.json"
+
+
+def test_calibration_drops_candidates_that_fail():
+    scores = seashell.calibrate_factories("task", {
+        "default": seashell.DefaultLoopFactory(), "broken": BrokenFactory()})
+    assert list(scores) == ["default"]
+    assert scores["default"] > 0
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        seashell.EventLoopManager(selection="adaptive", profile="gpu")
@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+import loop as seashell
+
+
+@pytest.fixture
+def loop():
+    loop = seashell.VirtualTimeLoopFactory().create_loop()
+    yield loop
+    loop.close()
+
+
+def attached(loop, **options):
+    controller = seashell.AdmissionController(**options)
+    controller.attach(loop)
+    return controller
+
+
+def test_rejects_everything_while_overloaded(loop):
+    controller = attached(loop, target_lag=0.05)
+
+    async def main():
+        controller.monitor.last_lag = 0.2
+        with pytest.raises(seashell.AdmissionRejected):
+            async with controller.admission():
+                pass
+        controller.monitor.last_lag = 0.0
+        async with controller.admission():
+            assert controller.inflight == 1
+
+    loop.run_until_complete(main())
+    controller.detach()
+    assert controller.snapshot()["rejected"] == 1
+    assert controller.snapshot()["admitted"] == 1
+    assert controller.inflight == 0
+
+
+def test_rejects_at_the_limit_without_max_wait(loop):
+    controller = attached(loop, initial_limit=2, max_limit=2)
+    release = asyncio.Event()
+    outcomes = []
+
+    async def request():
+        try:
+            async with controller.admission():
+                await release.wait()
+            outcomes.append("ok")
+        except seashell.AdmissionRejected:
+            outcomes.append("rejected")
+
+    async def main():
+        tasks = [asyncio.ensure_future(request()) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*tasks)
+
+    loop.run_until_complete(main())
+    controller.detach()
+    assert sorted(outcomes) == ["ok", "ok", "rejected"]
+
+
+def test_waiters_get_slots_in_order_or_time_out(loop):
+    controller = attached(loop, initial_limit=1, max_limit=1, max_wait=1.0, max_queue=2)
+    order = []
+
+    async def request(name, hold):
+        try:
+            async with controller.admission():
+                order.append(name)
+                await asyncio.sleep(hold)
+        except seashell.AdmissionRejected:
+            order.append(f"{name}:rejected")
+
+    async def main():
+        await asyncio.gather(request("a", 0.5), request("b", 0.7), request("c", 0.1),
+                             request("d", 0.1))
+
+    loop.run_until_complete(main())
+    controller.detach()
+    # d finds the queue full; c waits behind b past max_wait
+    assert order == ["a", "d:rejected", "b", "c:rejected"]
+    assert controller.deferred == 2
+    assert controller.snapshot()["queued"] == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot(loop):
+    controller = attached(loop, initial_limit=1, max_limit=1, max_wait=10.0)
+
+    async def holder():
+        async with controller.admission():
+            await asyncio.sleep(1)
+
+    async def main():
+        first = asyncio.ensure_future(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(holder())
+        await asyncio.sleep(0.1)
+        waiting.cancel()
+        await asyncio.gather(first, waiting, return_exceptions=True)
+
+    loop.run_until_complete(main())
+    controller.detach()
+    assert (controller.inflight, controller.snapshot()["queued"]) == (0, 0)
+
+
+def test_aimd_limit_backs_off_and_grows():
+    controller = seashell.AdmissionController(target_lag=0.05, initial_limit=10, backoff=0.5)
+    controller._on_sample(0.2)
+    assert controller.limit == 5
+    controller._on_sample(0.0)
+    assert controller.limit == 5  # Unused headroom does not grow
+    controller.inflight = 5
+    controller._on_sample(0.0)
+    assert controller.limit == 6
+
+
+def test_gradient_limit_shrinks_in_proportion():
+    controller = seashell.AdmissionController(target_lag=0.05, algorithm="gradient",
+                                              initial_limit=100, min_limit=10)
+    controller._on_sample(0.0625)
+    assert controller.limit == pytest.approx(80)
+    controller._on_sample(1.0)
+    assert controller.limit == pytest.approx(40)
+    for _ in range(5):
+        controller._on_sample(1.0)
+    assert controller.limit == 10
+
+
+def test_configuration_is_validated():
+    with pytest.raises(ValueError):
+        seashell.AdmissionController(algorithm="fifo")
+    with pytest.raises(ValueError):
+        seashell.AdmissionController(initial_limit=0)
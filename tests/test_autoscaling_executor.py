@@ -0,0 +1,106 @@
+import asyncio
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+import loop as seashell
+
+
+def _executor_threads():
+    return [thread for thread in threading.enumerate()
+            if thread.name.startswith("seashell-executor") and thread.is_alive()]
+
+
+def test_runs_work_and_reports_wait_times():
+    executor = seashell.AutoscalingExecutor(cpus=2, idle_timeout=1)
+    futures = [executor.submit(pow, 2, n) for n in range(50)]
+    assert [future.result(timeout=5) for future in futures] == [2 ** n for n in range(50)]
+    # Results are set before the item is accounted; shutdown waits for both
+    executor.shutdown(wait=True)
+    snapshot = executor.snapshot()
+    assert snapshot["completed"] == 50
+    assert snapshot["queue_depth"] == 0
+    assert snapshot["wait"]["count"] == 50
+
+
+def test_blocking_work_grows_the_pool():
+    executor = seashell.AutoscalingExecutor(cpus=1, idle_timeout=1)
+    try:
+        for _ in range(3):
+            futures = [executor.submit(time.sleep, 0.02) for _ in range(40)]
+            for future in futures:
+                future.result(timeout=10)
+        assert executor.blocking_ratio > 1
+        assert executor.target_workers > executor.cpus
+    finally:
+        executor.shutdown(wait=True)
+
+
+def test_submit_after_shutdown_raises():
+    executor = seashell.AutoscalingExecutor(cpus=1)
+    executor.shutdown(wait=True)
+    with pytest.raises(RuntimeError):
+        executor.submit(time.sleep, 0)
+
+
+@pytest.mark.parametrize("cpus", [1, 2, 4])
+def test_shutdown_with_busy_workers_is_prompt(cpus):
+    executor = seashell.AutoscalingExecutor(cpus=cpus, idle_timeout=5)
+    futures = [executor.submit(time.sleep, 0.1) for _ in range(4 * cpus)]
+    time.sleep(0.02)
+    started = time.monotonic()
+    executor.shutdown(wait=True)
+    assert time.monotonic() - started < 2
+    assert all(future.done() for future in futures)
+    assert _executor_threads() == []
+
+
+def test_shutdown_cancel_futures_drops_queued_work():
+    executor = seashell.AutoscalingExecutor(cpus=1, min_workers=1, max_workers=1)
+    running = executor.submit(time.sleep, 0.1)
+    queued = [executor.submit(time.sleep, 0.1) for _ in range(5)]
+    time.sleep(0.02)
+    executor.shutdown(wait=True, cancel_futures=True)
+    assert running.result() is None
+    assert all(future.cancelled() for future in queued)
+    assert executor.snapshot()["queue_depth"] == 0
+    assert _executor_threads() == []
+
+
+def test_interpreter_exit_does_not_wait_for_idle_timeout():
+    script = textwrap.dedent("""
+        import sys, time
+        sys.path.insert(0, sys.argv[1])
+        import loop
+        executor = loop.AutoscalingExecutor(cpus=4, idle_timeout=30)
+        for _ in range(16):
+            executor.submit(time.sleep, 0.05)
+        time.sleep(0.01)
+    """)
+    root = __import__("os").path.dirname(seashell.__file__)
+    started = time.monotonic()
+    subprocess.run([sys.executable, "-c", script, root], check=True, timeout=20,
+                   capture_output=True)
+    assert time.monotonic() - started < 10
+
+
+def test_attached_as_default_executor_and_shut_down_by_teardown():
+    manager = seashell.EventLoopManager()
+    loop = manager.setup()
+    try:
+        executor = manager.instruments["executor"]
+        assert isinstance(executor, seashell.AutoscalingExecutor)
+
+        async def main():
+            loop.run_in_executor(None, time.sleep, 0.1)
+            await asyncio.sleep(0.01)
+
+        loop.run_until_complete(main())
+    finally:
+        report = manager.teardown(loop, deadline=2)
+    assert report["default_executor"] == "ok"
+    assert _executor_threads() == []
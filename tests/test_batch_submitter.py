@@ -0,0 +1,122 @@
+import asyncio
+import threading
+
+import pytest
+
+import loop as seashell
+
+
+@pytest.fixture
+def attached():
+    loop = asyncio.new_event_loop()
+    submitter = seashell.BatchSubmitter(max_batch=64)
+    submitter.attach(loop)
+    yield loop, submitter
+    submitter.detach()
+    loop.close()
+
+
+def test_producers_share_wakeups_and_keep_their_order(attached):
+    loop, submitter = attached
+    wakeups = []
+    original = loop.call_soon_threadsafe
+
+    def counting(*args, **kwargs):
+        wakeups.append(None)
+        return original(*args, **kwargs)
+
+    loop.call_soon_threadsafe = counting
+    received = {index: [] for index in range(4)}
+    done = asyncio.Event()
+    total = 4 * 2000
+
+    def deliver(producer, value):
+        received[producer].append(value)
+        if sum(map(len, received.values())) == total:
+            done.set()
+
+    def produce(producer):
+        for value in range(2000):
+            submitter.call_soon(deliver, producer, value)
+
+    async def main():
+        threads = [threading.Thread(target=produce, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        await asyncio.wait_for(done.wait(), 10)
+        for thread in threads:
+            thread.join()
+
+    loop.run_until_complete(main())
+    assert all(values == list(range(2000)) for values in received.values())
+    assert submitter.items == total
+    assert len(wakeups) <= submitter.batches < total
+    assert submitter.snapshot()["queued"] == 0
+
+
+def test_submit_runs_coroutines_and_chains_results(attached):
+    loop, submitter = attached
+
+    async def double(value):
+        await asyncio.sleep(0)
+        return value * 2
+
+    async def fail():
+        raise KeyError("x")
+
+    results = []
+
+    def producer():
+        futures = [submitter.submit(double(i)) for i in range(10)]
+        results.extend(future.result(timeout=5) for future in futures)
+        with pytest.raises(KeyError):
+            submitter.submit(fail()).result(timeout=5)
+
+    thread = threading.Thread(target=producer)
+
+    async def main():
+        thread.start()
+        while thread.is_alive():
+            await asyncio.sleep(0.01)
+
+    loop.run_until_complete(main())
+    assert results == [value * 2 for value in range(10)]
+    with pytest.raises(TypeError):
+        submitter.submit(double)
+
+
+def test_callback_errors_reach_the_exception_handler(attached):
+    loop, submitter = attached
+    errors = []
+    loop.set_exception_handler(lambda loop, context: errors.append(context["exception"]))
+    ran = []
+    submitter.call_soon(lambda: 1 / 0)
+    submitter.call_soon(ran.append, True)
+    loop.run_until_complete(asyncio.sleep(0.01))
+    assert isinstance(errors[0], ZeroDivisionError)
+    assert ran == [True]
+
+
+def test_drains_yield_after_max_batch(attached):
+    loop, submitter = attached
+    ran = []
+    for index in range(200):
+        submitter.call_soon(ran.append, index)
+    loop.run_until_complete(asyncio.sleep(0.01))
+    assert ran == list(range(200))
+    assert submitter.batches == 4  # 64 + 64 + 64 + 8
+
+
+def test_requires_an_open_attached_loop():
+    submitter = seashell.BatchSubmitter()
+    with pytest.raises(RuntimeError):
+        submitter.call_soon(print)
+    loop = asyncio.new_event_loop()
+    submitter.attach(loop)
+    loop.close()
+    with pytest.raises(RuntimeError):
+        submitter.call_soon(print)
+    with pytest.raises(RuntimeError):
+        submitter.call_soon(print)  # The failed wakeup did not stick
+    with pytest.raises(ValueError):
+        seashell.BatchSubmitter(max_batch=0)
@@ -0,0 +1,47 @@
+import pytest
+
+import loop as seashell
+
+
+class BrokenFactory(seashell.LoopFactory):
+    def create_loop(self):
+        raise OSError("no loop for you")
+
+    def get_policy(self):
+        raise NotImplementedError
+
+
+QUICK = ["call_soon", "timers", "tasks", "tcp_echo", "executor", "cache_hit_tasks"]
+
+
+def test_every_workload_produces_results():
+    results = seashell.run_benchmarks({"default": seashell.DefaultLoopFactory()},
+                                      workloads=QUICK, scale=0.01)
+    assert list(results["default"]) == QUICK
+    for workload, result in results["default"].items():
+        assert result.error is None, workload
+        assert result.factory == "default" and result.workload == workload
+        assert result.operations > 0
+        assert result.ops_per_sec > 0
+        assert 0 <= result.p50_latency <= result.p99_latency
+
+
+def test_failures_are_recorded_not_raised():
+    results = seashell.run_benchmarks({"broken": BrokenFactory()}, workloads=["call_soon"],
+                                      scale=0.01)
+    assert results["broken"]["call_soon"].error == "OSError: no loop for you"
+    table = seashell.format_benchmark_results(results)
+    assert table.splitlines()[0].startswith("factory")
+    assert "skipped: OSError: no loop for you" in table
+
+
+def test_unknown_workload_is_rejected():
+    with pytest.raises(KeyError):
+        seashell.run_benchmark(seashell.DefaultLoopFactory(), "nope")
+
+
+def test_eager_comparison_runs_both_modes():
+    results = seashell.benchmark_eager_tasks(operations=500)
+    assert sorted(results) == ["eager", "regular"]
+    assert all(result.error is None and result.operations == 500
+               for result in results.values())
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+
+import loop as seashell
+
+
+@pytest.fixture
+def detected():
+    loop = asyncio.new_event_loop()
+    detector = seashell.BlockingCallDetector()
+    detector.attach(loop)
+    yield loop, detector
+    detector.detach()
+    loop.close()
+
+
+def kinds(detector):
+    return {entry["kind"]: entry for entry in detector.top(50)}
+
+
+def test_records_sleep_and_file_opens_on_the_loop_thread(detected, tmp_path):
+    loop, detector = detected
+    path = tmp_path / "data.txt"
+    path.write_text("x")  # Outside the loop: not recorded
+
+    async def handler():
+        time.sleep(0.01)
+        with open(path) as handle:
+            handle.read()
+
+    loop.run_until_complete(handler())
+    found = kinds(detector)
+    assert found["time.sleep"]["function"] == "handler"
+    assert found["time.sleep"]["total"] >= 0.01
+    assert found["time.sleep"]["filename"] == __file__
+    assert found["open"]["count"] == 1
+    assert found["open"]["total"] == 0.0
+    assert detector.blocking_count == 2
+
+
+def test_executor_threads_are_not_reported(detected):
+    loop, detector = detected
+
+    async def main():
+        await loop.run_in_executor(None, time.sleep, 0.01)
+
+    loop.run_until_complete(main())
+    assert "time.sleep" not in kinds(detector)
+
+
+def test_blocking_socket_calls_are_timed(detected):
+    loop, detector = detected
+
+    async def main():
+        left, right = seashell.socket.socketpair()
+        with left, right:
+            right.sendall(b"ping")
+            assert left.recv(4) == b"ping"
+
+    loop.run_until_complete(main())
+    assert {"socket.sendall", "socket.recv"} <= set(kinds(detector))
+
+
+def test_detach_restores_time_sleep():
+    original = time.sleep
+    loop = asyncio.new_event_loop()
+    detector = seashell.BlockingCallDetector()
+    detector.attach(loop)
+    assert time.sleep is not original
+    detector.detach()
+    loop.close()
+    assert time.sleep is original
+
+
+def test_one_detector_per_loop(detected):
+    loop, _ = detected
+    with pytest.raises(RuntimeError):
+        seashell.BlockingCallDetector().attach(loop)
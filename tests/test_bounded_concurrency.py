@@ -0,0 +1,103 @@
+import asyncio
+import contextlib
+
+import pytest
+
+import loop as seashell
+
+
+class Tracker:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.started = 0
+        self.cancelled = 0
+
+    async def job(self, value, delay):
+        self.active += 1
+        self.started += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(delay)
+            if isinstance(value, Exception):
+                raise value
+            return value
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+
+
+def run(coro):
+    loop = seashell.VirtualTimeLoopFactory().create_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_bounded_gather_keeps_input_order_and_limit():
+    tracker = Tracker()
+    jobs = (tracker.job(i, (7 * i % 5) / 10) for i in range(20))
+    assert run(seashell.bounded_gather(jobs, limit=3)) == list(range(20))
+    assert tracker.peak == 3
+
+
+def test_bounded_gather_cancels_the_rest_on_error():
+    tracker = Tracker()
+    jobs = [tracker.job(ValueError("boom"), 0.1)] + [tracker.job(i, 1.0) for i in range(1, 10)]
+
+    async def main():
+        with pytest.raises(ValueError):
+            await seashell.bounded_gather(iter(jobs), limit=3)
+
+    run(main())
+    assert tracker.started == 3
+    assert tracker.cancelled == 2
+    for job in jobs[3:]:
+        job.close()
+
+
+def test_bounded_gather_return_exceptions():
+    tracker = Tracker()
+    jobs = [tracker.job(0, 0.1), tracker.job(KeyError("x"), 0.2), tracker.job(2, 0.3)]
+    results = run(seashell.bounded_gather(jobs, limit=2, return_exceptions=True))
+    assert results[0] == 0 and isinstance(results[1], KeyError) and results[2] == 2
+
+
+def test_limit_must_be_positive():
+    with pytest.raises(ValueError):
+        run(seashell.bounded_gather([], limit=0))
+
+
+def test_stream_completed_yields_in_completion_order():
+    tracker = Tracker()
+
+    async def source():
+        for value, delay in [("slow", 0.3), ("fast", 0.1), ("mid", 0.2)]:
+            yield tracker.job(value, delay)
+
+    async def main():
+        return [value async for value in seashell.stream_completed(source(), limit=3)]
+
+    assert run(main()) == ["fast", "mid", "slow"]
+
+
+def test_aclosing_cancels_outstanding_work_on_exit():
+    tracker = Tracker()
+    jobs = iter([tracker.job(i, 0.1 * (i + 1)) for i in range(10)])
+
+    async def main():
+        async with contextlib.aclosing(seashell.stream_completed(jobs, limit=4)) as stream:
+            async for value in stream:
+                assert value == 0
+                break
+        # Closed on exit, not whenever the generator happens to be finalized
+        return tracker.active
+
+    assert run(main()) == 0
+    assert tracker.started == 4
+    assert tracker.cancelled == 3
+    for job in jobs:
+        job.close()
@@ -0,0 +1,101 @@
+import asyncio
+import sys
+
+import pytest
+
+import loop as seashell
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    loop.set_task_factory(seashell._backport_eager_task_factory)
+    yield loop
+    loop.close()
+
+
+def test_completes_without_touching_the_ready_queue(loop):
+    async def cached():
+        return 42
+
+    async def main():
+        queued = len(loop._ready)
+        task = asyncio.ensure_future(cached())
+        return task.done(), task.result(), len(loop._ready) - queued
+
+    assert loop.run_until_complete(main()) == (True, 42, 0)
+
+
+def test_current_task_is_the_child_during_its_eager_step(loop):
+    seen = {}
+
+    async def child():
+        seen["child"] = asyncio.current_task()
+        await asyncio.sleep(0)
+        seen["resumed"] = asyncio.current_task()
+
+    async def main():
+        parent = asyncio.current_task()
+        task = loop.create_task(child())
+        seen["parent"] = asyncio.current_task()
+        await task
+        return parent, task
+
+    parent, task = loop.run_until_complete(main())
+    assert seen["child"] is task
+    assert seen["resumed"] is task
+    assert seen["parent"] is parent
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="asyncio.timeout() needs 3.11")
+def test_timeout_in_eager_step_does_not_cancel_the_parent(loop):
+    async def child():
+        async with asyncio.timeout(0.05):
+            await asyncio.sleep(1)
+
+    async def main():
+        task = loop.create_task(child())
+        with pytest.raises(TimeoutError):
+            await task
+        await asyncio.sleep(0.1)  # The parent must not have been cancelled
+        return asyncio.current_task().cancelling()
+
+    assert loop.run_until_complete(main()) == 0
+
+
+def test_exceptions_are_stored_on_the_task(loop):
+    async def failing():
+        raise KeyError("x")
+
+    async def main():
+        task = loop.create_task(failing())
+        assert task.done()
+        with pytest.raises(KeyError):
+            await task
+
+    loop.run_until_complete(main())
+
+
+def test_tasks_created_before_the_loop_runs_start_lazily(loop):
+    started = []
+
+    async def child():
+        started.append(True)
+
+    task = loop.create_task(child())
+    assert started == []
+    loop.run_until_complete(task)
+    assert started == [True]
+
+
+def test_factory_selection():
+    factory = seashell.eager_task_factory()
+    if sys.version_info >= (3, 12):
+        assert factory is asyncio.eager_task_factory
+    else:
+        assert factory is seashell._backport_eager_task_factory
+    loop = seashell.DefaultLoopFactory(eager_tasks=True).create_loop()
+    try:
+        assert loop.get_task_factory() is not None
+    finally:
+        loop.close()
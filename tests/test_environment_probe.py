@@ -0,0 +1,27 @@
+import platform
+import subprocess
+import sys
+from pathlib import Path
+
+import loop as seashell
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_get_info_reports_the_full_python_version():
+    manager = seashell.EventLoopManager(factory="default")
+    info = manager.get_info()
+    assert info["python_version"] == platform.python_version()
+    assert info["system"] == platform.system().lower()
+
+
+def test_environment_probe_is_cached():
+    assert seashell._probe_environment() is seashell._probe_environment()
+
+
+def test_import_defers_optional_modules():
+    code = ("import sys, loop; "
+            "print(sorted(m for m in ('platform', 'tempfile', 'uvloop') if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    assert output.strip() == "[]"
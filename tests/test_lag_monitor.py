@@ -0,0 +1,68 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+import loop as seashell
+
+
+def test_histogram_error_is_bounded():
+    histogram = seashell.LatencyHistogram()
+    rng = random.Random(3)
+    values = sorted(rng.lognormvariate(-6, 2) for _ in range(20000))
+    for value in values:
+        histogram.record(value)
+    for percent in (50, 90, 99, 99.9):
+        exact = values[int(percent / 100 * len(values) + 0.5) - 1]
+        assert histogram.value_at_percentile(percent) == pytest.approx(exact, rel=0.03, abs=2e-6)
+    assert histogram.count == len(values)
+    assert histogram.max == pytest.approx(values[-1], rel=1e-5, abs=1e-6)
+    assert histogram.mean == pytest.approx(sum(values) / len(values), rel=0.01)
+
+
+def test_histogram_memory_is_fixed():
+    histogram = seashell.LatencyHistogram()
+    assert len(histogram._counts) < 1000
+    histogram.record(1e9)
+    histogram.record(-1.0)
+    assert histogram.max == pytest.approx(3600.0)
+    assert histogram.value_at_percentile(0) == 0.0
+
+
+def test_histogram_cumulative_counts_never_overstate():
+    histogram = seashell.LatencyHistogram()
+    for value in (0.0005, 0.0009, 0.0011, 0.05, 2.0):
+        histogram.record(value)
+    assert histogram.cumulative_counts([0.001, 0.01, 0.1, 10.0]) == [2, 3, 4, 5]
+    histogram.reset()
+    assert histogram.percentiles()["count"] == 0
+    assert histogram.cumulative_counts([1.0]) == [0]
+
+
+def test_monitor_measures_a_blocked_loop():
+    loop = asyncio.new_event_loop()
+    samples = []
+    monitor = seashell.LoopLagMonitor(interval=0.02, on_sample=samples.append)
+    monitor.attach(loop)
+
+    async def main():
+        await asyncio.sleep(0.2)
+        time.sleep(0.15)  # Block the loop past a probe
+        await asyncio.sleep(0.1)
+
+    try:
+        loop.run_until_complete(main())
+    finally:
+        monitor.detach()
+        loop.close()
+    snapshot = monitor.snapshot()
+    assert snapshot["count"] == len(samples) >= 5
+    assert snapshot["max"] >= 0.1
+    assert snapshot["p50"] < 0.02
+    assert max(samples) == pytest.approx(snapshot["max"], rel=0.03)
+
+
+def test_monitor_validates_interval():
+    with pytest.raises(ValueError):
+        seashell.LoopLagMonitor(interval=0)
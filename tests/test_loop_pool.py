@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+import loop as seashell
+
+
+@pytest.fixture
+def pool():
+    pool = seashell.LoopPool(size=2, manager=seashell.EventLoopManager(factory="default"),
+                             reset_timeout=0.2)
+    yield pool
+    pool.close()
+
+
+def test_loops_are_reused(pool):
+    assert pool.run(asyncio.sleep(0, "pong")) == "pong"
+    with pool.loop() as first:
+        pass
+    with pool.loop() as second:
+        assert second is first
+    assert (pool.created, pool.reused, pool.discarded) == (2, 3, 0)
+
+
+def test_leftovers_are_cleared_before_reuse(pool):
+    events = []
+
+    async def leftover():
+        try:
+            await asyncio.sleep(3600)
+        finally:
+            events.append("task unwound")
+
+    async def numbers():
+        try:
+            yield 1
+            yield 2
+        finally:
+            events.append("generator closed")
+
+    async def messy():
+        loop = asyncio.get_running_loop()
+        loop.create_task(leftover())
+        generator = numbers()
+        await generator.__anext__()
+        messy.generator = generator
+        loop.call_later(0.01, events.append, "stale timer")
+        loop.set_exception_handler(lambda loop, context: None)
+        loop.set_debug(True)
+
+    with pool.loop() as loop:
+        loop.run_until_complete(messy())
+    with pool.loop() as reused:
+        assert reused is loop
+        assert sorted(events) == ["generator closed", "task unwound"]
+        reused.run_until_complete(asyncio.sleep(0.05))
+        assert reused.get_exception_handler() is None
+        assert not reused.get_debug()
+        assert asyncio.all_tasks(reused) == set()
+    assert "stale timer" not in events
+
+
+def test_stubborn_loops_are_replaced(pool):
+    async def stubborn():
+        while True:
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                pass
+
+    async def start():
+        asyncio.get_running_loop().create_task(stubborn())
+        await asyncio.sleep(0)
+
+    with pool.loop() as loop:
+        loop.run_until_complete(start())
+    assert pool.discarded == 1
+    assert loop.is_closed()
+    with pool.loop() as other:
+        assert other is not loop
+
+
+def test_close_finalizes_idle_loops(pool):
+    loop = pool.acquire()
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    pool.release(loop)
+    assert loop.is_closed()
+    assert pool.discarded == 2
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+
+import loop as seashell
+
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def profile(coro_function, **options):
+    loop = asyncio.new_event_loop()
+    profiler = seashell.LoopProfiler(**options)
+    profiler.attach(loop)
+    try:
+        loop.run_until_complete(coro_function())
+    finally:
+        profiler.detach()
+        loop.close()
+    return profiler
+
+
+def leaves(profiler, name):
+    """Samples whose stack contains name, keyed by the stack."""
+    return {stack: count for stack, count in profiler._stacks.items()
+            if any(label.startswith(name) for label in stack)}
+
+
+def test_subtask_samples_carry_the_awaiting_handler():
+    async def worker():
+        await asyncio.sleep(0)
+        spin(0.3)
+
+    async def handler():
+        await asyncio.gather(asyncio.ensure_future(worker()))
+
+    profiler = profile(handler, hz=200)
+    stacks = leaves(profiler, "spin")
+    assert sum(stacks.values()) >= 20
+    stack = max(stacks, key=stacks.get)
+    names = [label.split(" ")[0] for label in stack]
+    assert names.index(
+        "test_subtask_samples_carry_the_awaiting_handler.<locals>.handler") < names.index(
+        "test_subtask_samples_carry_the_awaiting_handler.<locals>.worker") < names.index("spin")
+    assert not any(name.startswith("BaseEventLoop") for name in names)
+
+
+def test_idle_samples_are_labelled():
+    async def idle():
+        await asyncio.sleep(0.3)
+
+    profiler = profile(idle, hz=200)
+    idle_samples = sum(count for stack, count in profiler._stacks.items()
+                       if stack and stack[-1] == "[idle]")
+    assert idle_samples >= profiler.samples * 0.8
+
+
+def test_collapsed_output_and_overflow(tmp_path):
+    profiler = seashell.LoopProfiler(max_stacks=2)
+    for stack in [("a", "b"), ("a", "b"), ("a", "c"), ("d",), ("e",)]:
+        profiler._record(stack)
+    assert profiler.collapsed() == "a;b 2\n[other] 2\na;c 1\n"
+    path = tmp_path / "loop.folded"
+    profiler.write_collapsed(str(path))
+    assert path.read_text() == profiler.collapsed()
+    assert profiler.snapshot()["samples"] == 5
+    profiler.reset()
+    assert profiler.collapsed() == ""
+
+
+def test_configuration_is_validated():
+    with pytest.raises(ValueError):
+        seashell.LoopProfiler(hz=0)
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+
+import pytest
+
+import loop as seashell
+
+
+def make_pool(size=3):
+    return seashell.LoopThreadPool(size=size,
+                                   manager=seashell.EventLoopManager(factory="default"))
+
+
+async def where(value):
+    await asyncio.sleep(0)
+    return value, asyncio.get_running_loop(), threading.current_thread().name
+
+
+def test_each_loop_runs_in_its_own_thread():
+    with make_pool() as pool:
+        results = [pool.submit(where(i)).result(timeout=5) for i in range(6)]
+        loops = pool.loops
+    assert [value for value, _, _ in results] == list(range(6))
+    # Round-robin: submission i lands on loop i % size
+    assert [loops.index(loop) for _, loop, _ in results] == [0, 1, 2, 0, 1, 2]
+    assert {name for _, _, name in results} == {"loop-0", "loop-1", "loop-2"}
+    assert all(loop.is_closed() for loop in loops)
+
+
+def test_least_loaded_avoids_busy_loops():
+    with make_pool() as pool:
+        release = threading.Event()
+
+        async def blocked():
+            await asyncio.get_running_loop().run_in_executor(None, release.wait)
+
+        busy = [pool.submit_to(0, blocked()), pool.submit_to(1, blocked())]
+        assert pool.load() == [1, 1, 0]
+        _, loop, _ = pool.submit_least_loaded(where(None)).result(timeout=5)
+        assert loop is pool.loops[2]
+        release.set()
+        for future in busy:
+            future.result(timeout=5)
+        assert pool.load() == [0, 0, 0]
+
+
+def test_shutdown_cancels_pending_work():
+    pool = make_pool(size=1).start()
+    started = threading.Event()
+    unwound = threading.Event()
+
+    async def forever():
+        started.set()
+        try:
+            await asyncio.sleep(3600)
+        finally:
+            unwound.set()
+
+    future = pool.submit(forever())
+    assert started.wait(5)
+    pool.shutdown()
+    assert unwound.is_set()
+    assert future.cancelled()
+    late = where(1)
+    with pytest.raises(RuntimeError):
+        pool.submit(late)
+    late.close()
+
+
+def test_configuration_is_validated():
+    with pytest.raises(ValueError):
+        seashell.LoopThreadPool(size=0)
+    pool = make_pool(size=1).start()
+    try:
+        with pytest.raises(RuntimeError):
+            pool.start()
+    finally:
+        pool.shutdown()
@@ -0,0 +1,164 @@
+import asyncio
+import re
+import socket
+
+import pytest
+
+import loop as seashell
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})? (-?[0-9.e+-]+|NaN|[+-]Inf)$')
+
+
+def parse_exposition(body):
+    """Validate Prometheus text format and return {name: type}."""
+    types = {}
+    for line in body.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert name not in types, f"duplicate TYPE for {name}"
+            assert kind in ("gauge", "counter", "histogram")
+            if kind == "counter":
+                assert name.endswith("_total"), name
+            types[name] = kind
+        elif line.startswith("# HELP ") or not line:
+            continue
+        else:
+            match = SAMPLE.match(line)
+            assert match, f"invalid sample line: {line!r}"
+            base = match.group(1)
+            assert any(base == name or base.startswith(name + "_") for name in types), line
+    return types
+
+
+async def scrape(address, path=b"/metrics"):
+    reader, writer = await asyncio.open_connection(*address[:2])
+    writer.write(b"GET " + path + b" HTTP/1.1\r\nHost: x\r\n\r\n")
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return head.split(b"\r\n")[0].decode(), body.decode()
+
+
+async def wait_for_address(exporter):
+    for _ in range(100):
+        if exporter.address is not None:
+            return exporter.address
+        await asyncio.sleep(0.01)
+    raise AssertionError("exporter did not start listening")
+
+
+@pytest.fixture
+def manager():
+    manager = seashell.EventLoopManager(factory="default")
+    yield manager
+    manager.detach_instruments()
+
+
+def test_scrape_is_valid_exposition_format(manager):
+    loop = manager.create_loop(stall_deadline=1, autoscale_executor=True, admission_lag=0.05,
+                               coalesce_timers=0.05, metrics_port=0)
+
+    async def main():
+        exporter = manager.instruments_for(loop)["metrics"]
+        address = await wait_for_address(exporter)
+        await loop.run_in_executor(None, sum, [1, 2])
+        await asyncio.sleep(0.1)
+        return await scrape(address)
+
+    try:
+        status, body = loop.run_until_complete(main())
+    finally:
+        manager.teardown(loop)
+    assert status == "HTTP/1.1 200 OK"
+    types = parse_exposition(body)
+    assert types["seashell_tasks"] == "gauge"
+    assert types["seashell_executor_queue_depth"] == "gauge"
+    assert types["seashell_lag_seconds"] == "histogram"
+    assert types["seashell_stalls_stalled"] == "gauge"
+    assert types["seashell_stalls_stalls_total"] == "counter"
+    assert types["seashell_admission_rejected_total"] == "counter"
+    assert types["seashell_coalescing_wakeups_total"] == "counter"
+    assert types["seashell_executor_completed_total"] == "counter"
+    assert "seashell_stalls_stalled 0" in body.splitlines()
+
+
+def test_unknown_path_is_404(manager):
+    loop = manager.create_loop(metrics_port=0)
+
+    async def main():
+        address = await wait_for_address(manager.instruments_for(loop)["metrics"])
+        return await scrape(address, b"/nope")
+
+    try:
+        status, _ = loop.run_until_complete(main())
+    finally:
+        manager.teardown(loop)
+    assert status == "HTTP/1.1 404 Not Found"
+
+
+def test_idle_client_is_disconnected():
+    loop = asyncio.new_event_loop()
+    exporter = seashell.MetricsExporter(port=0, request_timeout=0.1)
+    exporter.attach(loop)
+
+    async def main():
+        address = await wait_for_address(exporter)
+        reader, writer = await asyncio.open_connection(*address[:2])
+        writer.write(b"GET /metrics HTTP/1.1\r\n")  # never finishes the request
+        closed = await asyncio.wait_for(reader.read(), 2)
+        writer.close()
+        await asyncio.sleep(0)
+        others = asyncio.all_tasks() - {asyncio.current_task()}
+        return closed, others
+
+    try:
+        closed, others = loop.run_until_complete(main())
+    finally:
+        exporter.detach()
+        loop.close()
+    assert closed == b""
+    assert not [task for task in others if "_handle" in repr(task)]
+
+
+def test_callback_counting_is_opt_in():
+    loop = asyncio.new_event_loop()
+    try:
+        plain = seashell.MetricsExporter(port=0)
+        plain.attach(loop)
+        assert type(loop._ready) is not seashell._CountingDeque
+        assert plain.collect()["callbacks"] is None
+        plain.detach()
+
+        counting = seashell.MetricsExporter(port=0, count_callbacks=True)
+        counting.attach(loop)
+        loop.run_until_complete(asyncio.sleep(0.01))
+        assert counting.collect()["callbacks"] > 0
+        assert "seashell_callbacks_total" in counting.render()
+        counting.detach()
+        assert type(loop._ready) is not seashell._CountingDeque
+    finally:
+        loop.close()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_serves_on_unix_socket(tmp_path):
+    path = str(tmp_path / "metrics.sock")
+    loop = asyncio.new_event_loop()
+    exporter = seashell.MetricsExporter(path=path)
+    exporter.attach(loop)
+
+    async def main():
+        await wait_for_address(exporter)
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b"GET /metrics HTTP/1.1\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+        return response
+
+    try:
+        response = loop.run_until_complete(main())
+    finally:
+        exporter.detach()
+        loop.close()
+    assert b"seashell_tasks" in response
+    parse_exposition(response.partition(b"\r\n\r\n")[2].decode())
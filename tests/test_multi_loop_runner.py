@@ -0,0 +1,65 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+import loop as seashell
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork") or not hasattr(seashell.socket, "SO_REUSEPORT"),
+    reason="MultiLoopRunner needs fork() and SO_REUSEPORT")
+
+
+async def handler(reader, writer):
+    writer.close()
+
+
+def fork_worker(exit_code=None):
+    """Fork a stand-in worker that exits at once or waits for a signal."""
+    pid = os.fork()
+    if pid == 0:
+        if exit_code is None:
+            signal.pause()
+        os._exit(exit_code or 0)
+    return pid
+
+
+def exited_subprocess(code):
+    child = subprocess.Popen([sys.executable, "-c", f"raise SystemExit({code})"])
+    # Let it exit without reaping it, so it is a zombie until someone waits
+    time.sleep(0.5)
+    return child
+
+
+def test_shutdown_leaves_unrelated_children_alone():
+    runner = seashell.MultiLoopRunner(handler, "127.0.0.1", 1, workers=1,
+                                      shutdown_timeout=0.5)
+    child = exited_subprocess(7)
+    runner._pids[fork_worker()] = 0
+    runner._shutdown_workers()
+    assert runner._pids == {}
+    assert child.wait(timeout=5) == 7
+
+
+def test_reaping_restarts_only_tracked_workers():
+    runner = seashell.MultiLoopRunner(handler, "127.0.0.1", 1, workers=1,
+                                      restart_delay=0.0)
+    spawned = []
+    runner._spawn = spawned.append
+    child = exited_subprocess(3)
+    crashed = fork_worker(exit_code=1)
+    running = fork_worker()
+    runner._pids.update({crashed: 0, running: 1})
+    try:
+        deadline = time.monotonic() + 5
+        while crashed in runner._pids and time.monotonic() < deadline:
+            assert runner._reap_and_restart()
+            time.sleep(0.05)
+        assert spawned == [0]
+        assert running in runner._pids
+        assert child.wait(timeout=5) == 3
+    finally:
+        runner._shutdown_workers()
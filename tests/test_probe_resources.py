@@ -0,0 +1,102 @@
+import functools
+import os
+
+import pytest
+
+import loop as seashell
+
+GIB = 1024 ** 3
+
+
+def write_tree(base, files):
+    for relative, content in files.items():
+        path = base / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return base
+
+
+def limits(tmp_path, files):
+    write_tree(tmp_path, files)
+    return seashell._cgroup_limits(root=str(tmp_path / "sys"),
+                                   proc_cgroup=str(tmp_path / "proc_cgroup"))
+
+
+def test_v2_own_cgroup(tmp_path):
+    assert limits(tmp_path, {
+        "proc_cgroup": "0::/kubepods/pod1/ctr\n",
+        "sys/cgroup.controllers": "cpu memory pids\n",
+        "sys/cpu.max": "max 100000\n",
+        "sys/memory.max": "max\n",
+        "sys/kubepods/pod1/ctr/cpu.max": "150000 100000\n",
+        "sys/kubepods/pod1/ctr/memory.max": f"{2 * GIB}\n",
+    }) == {"version": 2, "cpu_quota": 1.5, "memory_limit": 2 * GIB}
+
+
+def test_v2_namespaced_root_unlimited(tmp_path):
+    # Inside a cgroup namespace the process sits at "/" of its own mount
+    assert limits(tmp_path, {
+        "proc_cgroup": "0::/\n",
+        "sys/cgroup.controllers": "cpu memory\n",
+        "sys/cpu.max": "max 100000\n",
+        "sys/memory.max": "max\n",
+    }) == {"version": 2, "cpu_quota": None, "memory_limit": None}
+
+
+def test_v1_own_cgroup(tmp_path):
+    assert limits(tmp_path, {
+        "proc_cgroup": ("12:memory:/docker/abc\n"
+                        "4:cpu,cpuacct:/docker/abc\n"
+                        "1:name=systemd:/docker/abc\n"),
+        "sys/cpu/docker/abc/cpu.cfs_quota_us": "200000\n",
+        "sys/cpu/docker/abc/cpu.cfs_period_us": "100000\n",
+        "sys/memory/docker/abc/memory.limit_in_bytes": f"{GIB}\n",
+    }) == {"version": 1, "cpu_quota": 2.0, "memory_limit": GIB}
+
+
+def test_v1_falls_back_to_the_mount_root(tmp_path):
+    assert limits(tmp_path, {
+        "proc_cgroup": "4:cpu,cpuacct:/docker/abc\n12:memory:/docker/abc\n",
+        "sys/cpu/cpu.cfs_quota_us": "50000\n",
+        "sys/cpu/cpu.cfs_period_us": "100000\n",
+        "sys/memory/memory.limit_in_bytes": "9223372036854771712\n",
+    }) == {"version": 1, "cpu_quota": 0.5, "memory_limit": None}
+
+
+def test_v1_unlimited_quota(tmp_path):
+    assert limits(tmp_path, {
+        "proc_cgroup": "4:cpu,cpuacct:/\n",
+        "sys/cpu/cpu.cfs_quota_us": "-1\n",
+        "sys/cpu/cpu.cfs_period_us": "100000\n",
+        "sys/memory/memory.limit_in_bytes": "garbage\n",
+    }) == {"version": 1, "cpu_quota": None, "memory_limit": None}
+
+
+def test_no_cgroups(tmp_path):
+    assert limits(tmp_path, {"proc_cgroup": ""}) == {
+        "version": None, "cpu_quota": None, "memory_limit": None}
+
+
+def test_probe_resources_takes_the_smallest_bound(tmp_path, monkeypatch):
+    write_tree(tmp_path, {
+        "proc_cgroup": "0::/\n",
+        "sys/cgroup.controllers": "cpu memory\n",
+        "sys/cpu.max": "250000 100000\n",
+        "sys/memory.max": f"{GIB}\n",
+    })
+    monkeypatch.setattr(seashell, "_cgroup_limits", functools.partial(
+        seashell._cgroup_limits, root=str(tmp_path / "sys"),
+        proc_cgroup=str(tmp_path / "proc_cgroup")))
+    monkeypatch.setattr(os, "cpu_count", lambda: 64)
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(8)), raising=False)
+    resources = seashell.probe_resources(worker_memory=512 * 1024 * 1024)
+    assert resources["host_cpus"] == 64
+    assert resources["affinity_cpus"] == 8
+    assert resources["effective_cpus"] == 3  # 2.5 CPUs, rounded up
+    assert resources["recommended"] == {"loops": 3, "workers": 2, "executor_threads": 7}
+
+
+def test_probe_resources_on_this_host():
+    resources = seashell.probe_resources()
+    assert 1 <= resources["effective_cpus"] <= resources["host_cpus"]
+    assert resources["recommended"]["workers"] >= 1
@@ -0,0 +1,81 @@
+import asyncio
+import sys
+
+import pytest
+
+import loop as seashell
+
+
+@pytest.fixture
+def manager():
+    manager = seashell.EventLoopManager(factory="default")
+    yield manager
+    manager.close()
+    manager.detach_instruments()
+    asyncio.set_event_loop_policy(None)
+
+
+def test_run_reuses_one_loop_without_touching_the_policy(manager):
+    policy = asyncio.get_event_loop_policy()
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    first = manager.run(current_loop())
+    second = manager.run(current_loop())
+    assert first is second
+    assert asyncio.get_event_loop_policy() is policy
+    manager.close()
+    assert first.is_closed()
+
+
+def test_runner_attaches_instruments_to_its_own_loop(manager):
+    with manager.runner(monitor_lag=True) as runner:
+        loop = runner.get_loop()
+        assert isinstance(manager.instruments_for(loop)["lag"], seashell.LoopLagMonitor)
+        runner.run(asyncio.sleep(0.01))
+
+
+def test_run_leaves_setup_loop_instruments_in_place(manager):
+    loop = manager.setup(monitor_lag=True)
+    try:
+        instruments = dict(manager.instruments)
+        assert set(instruments) == {"lag", "executor"}
+
+        assert manager.run(asyncio.sleep(0, "done")) == "done"
+        assert manager.instruments == instruments
+        assert all(instrument.loop is loop for instrument in instruments.values())
+        assert loop._default_executor is instruments["executor"]
+
+        async def offload():
+            return await asyncio.get_running_loop().run_in_executor(None, sum, [1, 2])
+
+        assert loop.run_until_complete(offload()) == 3
+    finally:
+        report = manager.teardown(loop)
+    assert report["default_executor"] == "ok"
+    assert manager.instruments_for(loop) == {}
+
+
+def test_two_runners_keep_their_own_instruments(manager):
+    with manager.runner(monitor_lag=True) as first, manager.runner(monitor_lag=True) as second:
+        first_loop, second_loop = first.get_loop(), second.get_loop()
+        lag = manager.instruments_for(first_loop)["lag"]
+        assert lag.loop is first_loop
+        assert manager.instruments_for(second_loop)["lag"].loop is second_loop
+        first.run(asyncio.sleep(0.12))
+        assert lag.histogram.count > 0
+
+
+def test_closed_loops_are_forgotten(manager):
+    with manager.runner(monitor_lag=True) as runner:
+        loop = runner.get_loop()
+    lag = manager.instruments_for(loop)["lag"]
+    manager.create_loop().close()
+    assert manager.instruments_for(loop) == {}
+    assert lag.loop is None
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="asyncio.Runner is 3.11+")
+def test_runner_is_asyncio_runner(manager):
+    assert isinstance(manager.runner(), asyncio.Runner)
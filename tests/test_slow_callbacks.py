@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+
+import loop as seashell
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def test_aggregates_task_steps_and_callbacks(loop):
+    detector = seashell.SlowCallbackDetector(threshold=0.02)
+    detector.attach(loop)
+
+    def slow_callback():
+        time.sleep(0.03)
+
+    async def slow_task():
+        for _ in range(3):
+            time.sleep(0.03)
+            await asyncio.sleep(0)
+
+    async def main():
+        loop.call_soon(slow_callback)
+        loop.call_later(0.01, slow_callback)
+        await loop.create_task(slow_task())
+        await asyncio.sleep(0.02)
+
+    loop.run_until_complete(main())
+    detector.detach()
+    top = {entry["qualname"]: entry for entry in detector.top()}
+    assert top["test_aggregates_task_steps_and_callbacks.<locals>.slow_task"]["count"] == 3
+    callback = top["test_aggregates_task_steps_and_callbacks.<locals>.slow_callback"]
+    assert callback["count"] == 2
+    assert callback["filename"] == __file__
+    assert callback["total"] >= 0.06 and callback["max"] >= 0.03
+    assert detector.slow_count == 5
+    assert "main" not in " ".join(top)
+
+
+def test_table_is_bounded(loop):
+    detector = seashell.SlowCallbackDetector(threshold=0.001, max_entries=2)
+    detector.attach(loop)
+
+    def short():
+        time.sleep(0.002)
+
+    def longest():
+        time.sleep(0.01)
+
+    def medium():
+        time.sleep(0.005)
+
+    for callback in (short, longest, medium):
+        loop.call_soon(callback)
+    loop.call_soon(loop.stop)
+    loop.run_forever()
+    detector.detach()
+    # The smallest total is evicted to make room
+    assert [entry["qualname"].rsplit(".", 1)[-1] for entry in detector.top()] == [
+        "longest", "medium"]
+    detector.reset()
+    assert detector.snapshot()["slow_count"] == 0
+
+
+def test_detach_restores_the_loop(loop):
+    detector = seashell.SlowCallbackDetector()
+    detector.attach(loop)
+    assert "call_soon" in loop.__dict__
+    with pytest.raises(RuntimeError):
+        detector.attach(loop)
+    detector.detach()
+    assert not {"call_soon", "call_soon_threadsafe", "call_at"} & set(loop.__dict__)
+
+
+def test_configuration_is_validated():
+    with pytest.raises(ValueError):
+        seashell.SlowCallbackDetector(threshold=-1)
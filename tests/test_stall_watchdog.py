@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import pytest
+
+import loop as seashell
+
+
+def stall(seconds):
+    time.sleep(seconds)
+
+
+def test_reports_a_stall_once_with_stack_and_task(tmp_path):
+    loop = asyncio.new_event_loop()
+    path = tmp_path / "stalls.log"
+    watchdog = seashell.StallWatchdog(deadline=0.2, path=str(path))
+    watchdog.attach(loop)
+
+    async def inner():
+        stall(0.6)
+
+    async def handler():
+        await asyncio.sleep(0.05)
+        await inner()
+        await asyncio.sleep(0.1)
+
+    try:
+        loop.run_until_complete(loop.create_task(handler(), name="request-1"))
+    finally:
+        watchdog.detach()
+        loop.close()
+    assert watchdog.stalls == 1
+    report = watchdog.reports[-1]
+    assert report["task"] == "request-1"
+    assert report["coroutines"][0].startswith(
+        "test_reports_a_stall_once_with_stack_and_task.<locals>.handler")
+    assert "in stall" in report["stack"][-1]
+    assert 0.2 < report["stalled_for"] < 0.6 <= report["duration"] + 0.05
+    text = path.read_text()
+    assert text.startswith("Event loop stalled for") and "Current task: request-1" in text
+    assert watchdog.snapshot()["stalled"] is False
+
+
+def test_a_stopped_loop_is_not_stalled():
+    loop = asyncio.new_event_loop()
+    watchdog = seashell.StallWatchdog(deadline=0.1)
+    watchdog.attach(loop)
+    try:
+        loop.run_until_complete(asyncio.sleep(0.05))
+        time.sleep(0.4)
+        loop.run_until_complete(asyncio.sleep(0.05))
+    finally:
+        watchdog.detach()
+        loop.close()
+    assert watchdog.stalls == 0
+    assert watchdog.snapshot()["last"] is None
+
+
+def test_configuration_is_validated():
+    with pytest.raises(ValueError):
+        seashell.StallWatchdog(deadline=0)
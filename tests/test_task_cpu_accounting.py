@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import pytest
+
+import loop as seashell
+
+
+def spin(seconds):
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+async def cpu_bound():
+    for _ in range(3):
+        spin(0.02)
+        await asyncio.sleep(0)
+
+
+async def io_bound():
+    await asyncio.sleep(0.1)
+
+
+def account(main, inner=None):
+    accounting = seashell.TaskCPUAccounting()
+    loop = asyncio.new_event_loop()
+    loop.set_task_factory(accounting.task_factory(inner))
+    try:
+        loop.run_until_complete(main(loop))
+    finally:
+        loop.close()
+    return {entry["task"]: entry for entry in accounting.top()}, accounting
+
+
+@pytest.mark.parametrize("inner", [None, seashell.eager_task_factory()],
+                         ids=["lazy", "eager"])
+def test_cpu_is_charged_by_name_or_qualname(inner):
+    async def main(loop):
+        await asyncio.gather(loop.create_task(cpu_bound(), name="render"),
+                             loop.create_task(cpu_bound()),
+                             loop.create_task(io_bound()))
+
+    top, accounting = account(main, inner)
+    assert top["render"]["cpu"] == pytest.approx(0.06, abs=0.02)
+    assert top["render"]["steps"] == 4
+    assert top["cpu_bound"]["cpu"] == pytest.approx(0.06, abs=0.02)
+    assert top["io_bound"]["cpu"] < 0.01  # Waiting is not charged
+    assert not any(key.startswith("Task-") for key in top)
+    assert accounting.snapshot()["cpu"] >= 0.12
+
+
+def test_nested_eager_steps_are_charged_once():
+    async def child():
+        spin(0.03)
+
+    async def parent():
+        spin(0.01)
+        await asyncio.get_running_loop().create_task(child(), name="child")
+
+    async def main(loop):
+        await loop.create_task(parent(), name="parent")
+
+    top, _ = account(main, seashell.eager_task_factory())
+    assert top["child"]["cpu"] == pytest.approx(0.03, abs=0.01)
+    assert top["parent"]["cpu"] == pytest.approx(0.01, abs=0.01)
+
+
+def test_keys_beyond_max_entries_are_merged():
+    accounting = seashell.TaskCPUAccounting(max_entries=2)
+    for key in ("a", "b", "c", "d"):
+        accounting._charge(key, 0.1)
+    assert sorted(entry["task"] for entry in accounting.top()) == ["[other]", "a", "b"]
+    assert sum(entry["share"] for entry in accounting.top()) == pytest.approx(1.0)
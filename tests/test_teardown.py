@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+
+import loop as seashell
+
+
+@pytest.fixture
+def manager():
+    return seashell.EventLoopManager(factory="default")
+
+
+def test_deadline_bounds_a_running_executor_job(manager):
+    loop = manager.create_loop()
+    loop.run_until_complete(asyncio.sleep(0))
+    job = loop.run_in_executor(None, time.sleep, 3)
+    started = time.monotonic()
+    report = manager.teardown(loop, deadline=0.2)
+    assert time.monotonic() - started < 1.0
+    assert report["default_executor"] == "timeout"
+    assert loop.is_closed()
+    assert not job.done()
+
+
+def test_stubborn_tasks_are_reported(manager):
+    loop = manager.create_loop()
+
+    async def stubborn():
+        while True:
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                pass
+
+    async def polite():
+        await asyncio.sleep(3600)
+
+    async def main():
+        loop.create_task(stubborn(), name="stubborn")
+        loop.create_task(polite(), name="polite")
+        await asyncio.sleep(0)
+
+    loop.run_until_complete(main())
+    report = manager.teardown(loop, deadline=0.2)
+    assert report["cancelled"] == 2
+    assert len(report["pending_tasks"]) == 1
+    assert "stubborn" in report["pending_tasks"][0]
+    assert report["elapsed"] < 1.0
+
+
+def test_asyncgens_are_finalized(manager):
+    loop = manager.create_loop()
+    closed = []
+
+    async def numbers():
+        try:
+            for i in range(10):
+                yield i
+        finally:
+            closed.append(True)
+
+    async def main():
+        generator = numbers()
+        await generator.__anext__()
+        main.generator = generator  # Keep it alive, suspended
+
+    loop.run_until_complete(main())
+    report = manager.teardown(loop, deadline=1.0)
+    assert report["asyncgens"] == "ok"
+    assert closed == [True]
+
+
+def test_deadline_is_wall_clock_on_virtual_time(manager):
+    loop = seashell.VirtualTimeLoopFactory().create_loop()
+
+    async def sleepy_cleanup():
+        try:
+            await asyncio.sleep(3600)
+        finally:
+            await asyncio.sleep(10)  # Virtual, so it finishes at once
+
+    async def main():
+        loop.create_task(sleepy_cleanup())
+        await asyncio.sleep(0)
+
+    loop.run_until_complete(main())
+    report = manager.teardown(loop, deadline=1.0)
+    assert report["pending_tasks"] == []
+    assert report["elapsed"] < 0.5
+
+
+def test_idle_loop_is_closed_without_running(manager):
+    loop = manager.create_loop()
+    report = manager.teardown(loop)
+    assert report["cancelled"] == 0
+    assert report["default_executor"] == "skipped"
+    assert loop.is_closed()
+
+
+def test_running_loop_is_refused(manager):
+    loop = manager.create_loop()
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            manager.teardown(loop)
+
+    loop.run_until_complete(main())
+    manager.teardown(loop)
@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+import pytest
+
+import loop as seashell
+
+
+def run_scenario(coalesce):
+    """Interleave timers, call_soon() and task wakeups and log the order."""
+    loop = seashell.VirtualTimeLoopFactory().create_loop()
+    coalescer = None
+    if coalesce:
+        coalescer = seashell.TimerCoalescer(slack=0.125, min_delay=0.0)
+        coalescer.attach(loop)
+    log = []
+
+    def timer(name):
+        log.append(name)
+        loop.call_soon(log.append, f"{name}:soon")
+
+    async def sleeper(name, delay):
+        await asyncio.sleep(delay)
+        log.append(name)
+
+    async def main():
+        start = loop.time()
+        # Distinct deadlines on the coalescing grid, so nothing is deferred
+        # and the stdlib order is fully determined
+        tasks = [loop.create_task(sleeper(f"task{i}", 0.25 + 0.5 * i)) for i in range(6)]
+        for i in range(6):
+            loop.call_at(start + 0.5 * (i + 1), timer, f"timer{i}")
+        loop.call_at(start + 1.125, loop.call_soon, log.append, "nested")
+        await asyncio.gather(*tasks)
+        await asyncio.sleep(2)
+
+    try:
+        loop.run_until_complete(main())
+        return log, coalescer.snapshot() if coalescer else None
+    finally:
+        if coalescer is not None:
+            coalescer.detach()
+        loop.close()
+
+
+def test_order_matches_uncoalesced_timers():
+    expected, _ = run_scenario(coalesce=False)
+    actual, stats = run_scenario(coalesce=True)
+    assert actual == expected
+    assert stats["scheduled"] >= 13
+
+
+def test_never_early_and_in_deadline_order():
+    loop = seashell.VirtualTimeLoopFactory().create_loop()
+    coalescer = seashell.TimerCoalescer(slack=0.05)
+    coalescer.attach(loop)
+    fired = []
+    start = loop.time()
+    delays = [0.1 + (i * 37 % 100) / 100 for i in range(200)]
+    for delay in delays:
+        loop.call_later(delay, lambda d=delay: fired.append((d, loop.time() - start)))
+    loop.run_until_complete(asyncio.sleep(1.5))
+    coalescer.detach()
+    loop.close()
+    assert len(fired) == len(delays)
+    assert [delay for delay, _ in fired] == sorted(delays)
+    for delay, elapsed in fired:
+        assert delay - 1e-9 <= elapsed <= delay + 0.05 + 1e-9
+
+
+def test_cancelled_handles_do_not_run():
+    loop = seashell.VirtualTimeLoopFactory().create_loop()
+    coalescer = seashell.TimerCoalescer(slack=0.1)
+    coalescer.attach(loop)
+    fired = []
+    keep = loop.call_later(0.5, fired.append, "keep")
+    drop = loop.call_later(0.5, fired.append, "drop")
+    drop.cancel()
+    lonely = loop.call_later(1.0, fired.append, "lonely")
+    lonely.cancel()
+    loop.run_until_complete(asyncio.sleep(1.5))
+    assert fired == ["keep"]
+    assert keep.when() <= loop.time()
+    assert coalescer.snapshot()["buckets"] == 0
+    coalescer.detach()
+    loop.close()
+
+
+def test_each_callback_is_its_own_ready_handle():
+    manager = seashell.EventLoopManager(factory="default")
+    loop = manager.create_loop(coalesce_timers=0.05, slow_callback_threshold=0.02)
+
+    def slow():
+        time.sleep(0.03)
+
+    def fast():
+        pass
+
+    async def main():
+        loop.call_later(0.1, slow)
+        loop.call_later(0.1, fast)
+        await asyncio.sleep(0.2)
+
+    try:
+        loop.run_until_complete(main())
+        top = manager.instruments_for(loop)["slow_callbacks"].top()
+    finally:
+        manager.teardown(loop)
+    assert [entry["qualname"] for entry in top] == [
+        "test_each_callback_is_its_own_ready_handle.<locals>.slow"]
+
+
+def test_call_at_on_closed_loop_raises():
+    loop = asyncio.new_event_loop()
+    coalescer = seashell.TimerCoalescer(slack=0.05)
+    coalescer.attach(loop)
+    when = loop.time() + 10
+    loop.call_at(when, print)
+    loop.close()
+    with pytest.raises(RuntimeError):
+        loop.call_at(when, print)  # Same bucket, no new loop timer needed
+    coalescer.detach()
+
+
+def test_instrument_timers_bypass_the_coalescer():
+    manager = seashell.EventLoopManager(factory="default")
+    loop = manager.create_loop(monitor_lag=True, lag_interval=0.1, coalesce_timers=0.05)
+    try:
+        loop.run_until_complete(asyncio.sleep(0.6))
+        lag = manager.instruments_for(loop)["lag"].histogram.percentiles()
+    finally:
+        manager.teardown(loop)
+    assert lag["count"] >= 3
+    assert lag["p50"] < 0.02
+
+
+def test_detaching_the_detector_restores_the_coalescer():
+    loop = asyncio.new_event_loop()
+    coalescer = seashell.TimerCoalescer(slack=0.05)
+    coalescer.attach(loop)
+    detector = seashell.SlowCallbackDetector(0.1)
+    detector.attach(loop)
+    detector.detach()
+    assert loop.call_at == coalescer.call_at
+    coalescer.detach()
+    assert "call_at" not in loop.__dict__
+    loop.close()
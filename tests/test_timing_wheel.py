@@ -0,0 +1,126 @@
+import asyncio
+import random
+import sys
+
+import pytest
+
+import loop as seashell
+
+# Task.cancelling()/uncancel() and asyncio.timeout() are 3.11+
+needs_cancel_counts = pytest.mark.skipif(sys.version_info < (3, 11), reason="Python 3.11+")
+
+
+@pytest.fixture
+def loop():
+    loop = seashell.VirtualTimeLoopFactory().create_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def wheel(loop):
+    wheel = seashell.TimingWheel(tick=0.01, slots=16, levels=3)
+    wheel.attach(loop)
+    yield wheel
+    wheel.detach()
+
+
+def test_timers_fire_in_order_and_never_early(loop, wheel):
+    rng = random.Random(1234)
+    fired = []
+    start = loop.time()
+    delays = [rng.uniform(0, 5) for _ in range(2000)]
+    for index, delay in enumerate(delays):
+        wheel.call_later(delay, lambda i=index: fired.append((loop.time() - start, i)))
+
+    loop.run_until_complete(asyncio.sleep(5.1))
+    assert len(fired) == len(delays)
+    previous = -1.0
+    for elapsed, index in fired:
+        assert elapsed >= delays[index] - 1e-9
+        assert elapsed <= delays[index] + wheel.tick + 1e-6
+        assert elapsed >= previous
+        previous = elapsed
+    assert len(wheel) == 0
+
+
+def test_cancel_and_reschedule(loop, wheel):
+    fired = []
+    cancelled = wheel.call_later(0.1, fired.append, "cancelled")
+    moved = wheel.call_later(0.1, fired.append, "moved")
+    cancelled.cancel()
+    moved.reschedule(0.3)
+    loop.run_until_complete(asyncio.sleep(0.2))
+    assert fired == []
+    loop.run_until_complete(asyncio.sleep(0.2))
+    assert fired == ["moved"]
+    assert cancelled.cancelled()
+
+
+@needs_cancel_counts
+def test_timeout_expires(loop, wheel):
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            async with wheel.timeout(0.05):
+                await asyncio.sleep(1)
+        task = asyncio.current_task()
+        assert task.cancelling() == 0
+        await asyncio.sleep(0)  # no stale cancellation left behind
+        return "ok"
+
+    assert loop.run_until_complete(main()) == "ok"
+
+
+def test_timeout_not_expired(loop, wheel):
+    async def main():
+        async with wheel.timeout(1) as handle:
+            await asyncio.sleep(0.05)
+        assert handle.cancelled()
+        return "ok"
+
+    assert loop.run_until_complete(main()) == "ok"
+    assert len(wheel) == 0
+
+
+@needs_cancel_counts
+def test_expiry_swallowed_by_the_block_is_withdrawn(loop, wheel):
+    async def main():
+        async with wheel.timeout(0.05):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                pass  # the block finishes normally after the wheel fired
+        return asyncio.current_task().cancelling()
+
+    assert loop.run_until_complete(main()) == 0
+
+
+@needs_cancel_counts
+def test_outside_cancel_in_the_same_tick_is_not_a_timeout(loop, wheel):
+    async def body(started):
+        async with wheel.timeout(0.05):
+            started.set_result(None)
+            await asyncio.sleep(1)
+
+    async def main():
+        started = loop.create_future()
+        task = loop.create_task(body(started))
+        await started
+        # Registered after the timeout's own timer, in the same tick
+        wheel.call_later(0.05, task.cancel)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert task.cancelled()
+
+    loop.run_until_complete(main())
+
+
+@needs_cancel_counts
+def test_outer_asyncio_timeout_still_works(loop, wheel):
+    async def main():
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(0.05):
+                async with wheel.timeout(1):
+                    await asyncio.sleep(1)
+
+    loop.run_until_complete(main())
@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+import pytest
+
+import loop as seashell
+
+
+@pytest.fixture
+def monitored():
+    loop = asyncio.new_event_loop()
+    monitor = seashell.LoopUtilizationMonitor(resolution=0.1)
+    monitor.attach(loop)
+    yield loop, monitor
+    monitor.detach()
+    loop.close()
+
+
+async def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        time.sleep(0.01)
+        await asyncio.sleep(0)
+
+
+def test_idle_and_busy_loops(monitored):
+    loop, monitor = monitored
+    assert monitor.mode == "selector"
+    loop.run_until_complete(asyncio.sleep(0.5))
+    assert monitor.utilization(1.0) < 0.2
+    loop.run_until_complete(busy(0.5))
+    assert monitor.utilization(0.3) > 0.8
+
+
+def test_stopped_time_is_not_sampled(monitored):
+    loop, monitor = monitored
+    loop.run_until_complete(busy(0.3))
+    time.sleep(1.0)  # Loop stopped: neither busy nor idle
+    loop.run_until_complete(asyncio.sleep(0.3))
+    walls = sum(wall for wall, _ in monitor._samples)
+    assert walls < 0.9
+    assert 0.3 < monitor.utilization(10.0) < 0.7
+
+
+def test_detach_restores_the_loop(monitored):
+    loop, monitor = monitored
+    monitor.detach()
+    assert "run_forever" not in loop.__dict__
+    assert "select" not in loop._selector.__dict__
+    monitor.attach(loop)
+
+
+def test_resolution_is_validated():
+    with pytest.raises(ValueError):
+        seashell.LoopUtilizationMonitor(resolution=2.0)
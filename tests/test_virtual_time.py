@@ -0,0 +1,88 @@
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+import loop as seashell
+
+
+@pytest.fixture
+def loop():
+    loop = seashell.VirtualTimeLoopFactory().create_loop()
+    yield loop
+    loop.close()
+
+
+def test_long_sleeps_complete_instantly(loop):
+    started = time.monotonic()
+    loop.run_until_complete(asyncio.sleep(3600))
+    assert time.monotonic() - started < 0.5
+    assert loop.time() == pytest.approx(3600.0)
+
+
+def test_timer_order_is_preserved(loop):
+    fired = []
+
+    async def main():
+        for delay in (5, 1, 3, 2, 4):
+            loop.call_later(delay, lambda d=delay: fired.append((d, loop.time())))
+        await asyncio.sleep(10)
+
+    loop.run_until_complete(main())
+    assert [delay for delay, _ in fired] == [1, 2, 3, 4, 5]
+    assert all(when == pytest.approx(delay) for delay, when in fired)
+
+
+def test_timeouts_and_backoff_run_on_virtual_time(loop):
+    attempts = []
+
+    async def flaky():
+        attempts.append(loop.time())
+        await asyncio.sleep(60)
+
+    async def retry():
+        delay = 1.0
+        for _ in range(4):
+            try:
+                return await asyncio.wait_for(flaky(), timeout=10)
+            except asyncio.TimeoutError:
+                await asyncio.sleep(delay)
+                delay *= 2
+        return None
+
+    assert loop.run_until_complete(retry()) is None
+    assert attempts == pytest.approx([0.0, 11.0, 23.0, 37.0])
+
+
+def test_real_io_and_threads_still_work(loop):
+    async def main():
+        reader_sock, writer_sock = socket.socketpair()
+        reader, _ = await asyncio.open_connection(sock=reader_sock)
+        threading.Timer(0.05, writer_sock.sendall, (b"hello\n",)).start()
+        line = await reader.readline()
+        writer_sock.close()
+        reader_sock.close()
+        return line, await loop.run_in_executor(None, sum, [1, 2, 3])
+
+    assert loop.run_until_complete(main()) == (b"hello\n", 6)
+    assert loop.time() == 0.0  # Nothing pending on the clock, so it never moved
+
+
+def test_clock_cannot_move_backwards(loop):
+    with pytest.raises(ValueError):
+        loop.advance(-1)
+    loop.advance(5)
+    assert loop.time() == 5
+
+
+def test_factory_is_testing_only():
+    assert "virtual" not in seashell.available_factories()
+    assert "virtual" in seashell.available_factories(include_testing=True)
+    policy = seashell.VirtualTimeLoopFactory().get_policy()
+    loop = policy.new_event_loop()
+    try:
+        assert isinstance(loop, seashell.VirtualTimeEventLoop)
+    finally:
+        loop.close()